@@ -1,10 +1,113 @@
 #!/usr/bin/env python3
-import aws_cdk as cdk
-from weather.stack import Weather
+import hashlib
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
 
-app = cdk.App()
-_ = Weather(app, "weather")
-app.synth()
+# Stack traces are only used to decorate synth error messages; capturing one for
+# every token and resource is the bulk of synth time, so skip it unless overridden.
+os.environ.setdefault("CDK_DISABLE_STACK_TRACE", "1")
+
+# Everything that can change the synthesized assembly. The whole weather/ package is
+# hashed (not just the .py files) because the Docker and frontend asset hashes are
+# baked into the manifest, so a cached assembly must not outlive its asset sources.
+# pyproject.toml and uv.lock pin aws-cdk-lib: an upgrade must re-synthesize.
+SYNTH_INPUTS = [
+    "app.py",
+    "cdk.json",
+    "cdk.context.json",
+    "pyproject.toml",
+    "uv.lock",
+    "weather",
+]
+SYNTH_ENV = [
+    "CDK_CONTEXT_JSON",
+    "CDK_DEFAULT_ACCOUNT",
+    "CDK_DEFAULT_REGION",
+    "CDK_MINIFY_TEMPLATE",
+    "STREAM",
+]
+
+
+def source_key() -> str:
+    digest = hashlib.sha256(str(sys.version_info).encode())
+    for name in SYNTH_ENV:
+        digest.update(f"{name}={os.environ.get(name, '')}".encode())
+    for root in map(Path, SYNTH_INPUTS):
+        files = sorted(root.rglob("*")) if root.is_dir() else [root]
+        for path in files:
+            if path.is_file() and "__pycache__" not in path.parts:
+                digest.update(str(path).encode())
+                digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def minify_templates(outdir: Path) -> None:
+    # The CDK pretty-prints templates; CloudFormation doesn't care, and the bytes
+    # count against the 460,800-byte template limit and the upload to the staging bucket.
+    for template in outdir.glob("*.template.json"):
+        body = json.loads(template.read_text())
+        template.write_text(json.dumps(body, separators=(",", ":")))
+
+
+def default_outdir() -> Path:
+    # The CLI always passes CDK_OUTDIR (point it at tmpfs with `cdk --output /dev/shm/...`).
+    # When app.py is run directly, write the assembly to RAM where available.
+    if "CDK_OUTDIR" in os.environ:
+        return Path(os.environ["CDK_OUTDIR"])
+    # A real ./cdk.out (e.g. from an earlier CLI run) is what tooling reads: keep using it
+    # rather than writing a second assembly somewhere else.
+    if not os.path.isdir("/dev/shm") or Path("cdk.out").is_dir():
+        return Path("cdk.out")
+    # One directory per checkout, so projects on the same host don't overwrite each
+    # other's assembly and synth cache. No ./cdk.out symlink is left behind: the CLI
+    # creates that path itself and would trip over a link dangling after a reboot.
+    checkout = hashlib.sha256(str(Path.cwd().resolve()).encode()).hexdigest()[:12]
+    outdir = Path(f"/dev/shm/cdk.out-{checkout}")
+    outdir.mkdir(exist_ok=True)
+    print(f"Writing the Cloud Assembly to {outdir} (use `cdk --app {outdir}`)", file=sys.stderr)
+    return outdir
+
+
+def synth() -> None:
+    outdir = default_outdir()
+    cache_root = outdir / ".synth-cache"
+    cached = cache_root / source_key()
+
+    # Nothing changed since the last synth: reuse the previous Cloud Assembly
+    # without even loading the CDK (and its jsii bridge).
+    if (cached / "manifest.json").exists():
+        shutil.copytree(cached, outdir, dirs_exist_ok=True)
+        return
+
+    import aws_cdk as cdk
+    from weather.stack import Weather
+
+    # analytics_reporting=False drops the AWS::CDK::Metadata resource and
+    # tree_metadata=False skips the extra construct-tree walk that writes tree.json.
+    app = cdk.App(
+        outdir=str(outdir),
+        analytics_reporting=False,
+        tree_metadata=False,
+        context={"aws:cdk:disable-stack-trace": True},
+    )
+    _ = Weather(app, "weather")
+    app.synth()
+
+    if os.getenv("CDK_MINIFY_TEMPLATE"):
+        minify_templates(outdir)
+
+    # Keep only the latest assembly; older keys can never be hit again.
+    shutil.rmtree(cache_root, ignore_errors=True)
+    shutil.copytree(
+        outdir, cached, ignore=shutil.ignore_patterns(".synth-cache", "*.lock")
+    )
+
+
+if __name__ == "__main__":
+    synth()
 
 
 """
@@ -1,9 +1,28 @@
-from aws_cdk import Duration, Fn, RemovalPolicy
+import os
+
+from aws_cdk import Duration, Fn, RemovalPolicy, Size, Stack
+from aws_cdk.aws_ecr_assets import Platform
 from constructs import Construct
 import aws_cdk.aws_iam as iam
 import aws_cdk.aws_lambda as _lambda
 import aws_cdk.aws_s3 as s3
 
+BACKEND_SRC = "weather/backend/src"
+MODEL_ID = "global.anthropic.claude-haiku-4-5-20251001-v1:0"
+# Covers both bedrock:InvokeModel and bedrock:InvokeModelWithResponseStream.
+BEDROCK_ACTIONS = ("bedrock:InvokeModel*",)
+
+
+# Fn.select/Fn.split are round trips over the jsii bridge; URL tokens are unique
+# strings, so any construct asking for the same URL's domain gets the same token back.
+_domain_names: dict[str, str] = {}
+
+
+def domain_name_of(url: str) -> str:
+    if url not in _domain_names:
+        _domain_names[url] = Fn.select(2, Fn.split("/", url))
+    return _domain_names[url]
+
 
 class Backend(Construct):
     # Backend is defined as a CDK Construct — a reusable building block.
@@ -30,33 +49,53 @@ class Backend(Construct):
         # Creates an S3 bucket named StateBucket.
         # The removal_policy=RemovalPolicy.DESTROY means the bucket will be deleted
         # when the stack is destroyed (good for dev/lab setups, but not for production).
+        # auto_delete_objects empties it first, since CloudFormation can't delete a non-empty bucket.
         # The bucket is likely used to store temporary state (like chat sessions, weather data, or model responses).
         state_bucket = s3.Bucket(
             self,
             "StateBucket",
             removal_policy=RemovalPolicy.DESTROY,
+            auto_delete_objects=True,
         )
 
         """  Define the Lambda function (Docker-based)  """
         # This Lambda is built from a Docker image in weather/backend/src/Dockerfile.
         # That means your app logic and dependencies are packaged as a container
         # — ideal for custom dependencies (like the AWS Bedrock SDK or AI inference logic).
+        # The platform must match the function's Graviton (arm64) architecture below.
+        code = _lambda.DockerImageCode.from_image_asset(
+            directory=BACKEND_SRC,
+            file="Dockerfile",
+            platform=Platform.LINUX_ARM64,
+        )
+
+        # STREAM=0 switches both the Function URL and the Lambda Web Adapter to buffered
+        # responses, which avoids the per-chunk framing overhead for short answers.
+        # The two settings must agree, so they're derived from the same flag.
+        stream = os.getenv("STREAM", "1") == "1"
+        invoke_mode = (
+            _lambda.InvokeMode.RESPONSE_STREAM if stream else _lambda.InvokeMode.BUFFERED
+        )
+
         fn = _lambda.DockerImageFunction(
             self,
             "WeatherBackend",
             function_name="WeatherBackend",
             timeout=Duration.seconds(60),
-            architecture=_lambda.Architecture.X86_64,
-            code=_lambda.DockerImageCode.from_image_asset(
-                directory="weather/backend/src", file="Dockerfile"
-            ),
+            # Lambda allocates CPU in proportion to memory: 1024 MB gets ~8x the vCPU share
+            # of the 128 MB default, which speeds up the JSON/SSE work on every streamed response.
+            memory_size=1024,
+            ephemeral_storage_size=Size.mebibytes(512),
+            architecture=_lambda.Architecture.ARM_64,
+            code=code,
             # Environment variables:
             # MODEL_ID: the Bedrock model to use (here, Claude Haiku 4.5).
-            # AWS_LWA_INVOKE_MODE: enables response streaming, so results stream back progressively.
+            # AWS_LWA_INVOKE_MODE: response_stream streams results back progressively; buffered
+            # returns the whole response at once.
             # STATE_BUCKET: passes the name of the S3 bucket for the function to use.
             environment={
-                "MODEL_ID": "global.anthropic.claude-haiku-4-5-20251001-v1:0",
-                "AWS_LWA_INVOKE_MODE": "response_stream",
+                "MODEL_ID": MODEL_ID,
+                "AWS_LWA_INVOKE_MODE": "response_stream" if stream else "buffered",
                 "STATE_BUCKET": state_bucket.bucket_name,
             },
         )
@@ -68,25 +107,35 @@ class Backend(Construct):
         """  Add IAM policy for Bedrock  """
         # Add Bedrock permissions to the Lambda function
         # Grants the Lambda permission to call Bedrock models, including streaming ones.
-        # "*" means all models; you could scope this down to your specific model ARN for tighter security.
+        # MODEL_ID is a global cross-region inference profile, so the function needs the
+        # profile itself plus the foundation model it may route to in any region
+        # (global profiles also authorize against the region-less model ARN).
+        stack = Stack.of(self)
+        foundation_model = MODEL_ID.split(".", 1)[1]
         fn.add_to_role_policy(
             iam.PolicyStatement(
                 effect=iam.Effect.ALLOW,
-                actions=[
-                    "bedrock:InvokeModelWithResponseStream",
-                    "bedrock:InvokeModel",
+                actions=list(BEDROCK_ACTIONS),
+                resources=[
+                    f"arn:aws:bedrock:{stack.region}:{stack.account}:inference-profile/{MODEL_ID}",
+                    f"arn:aws:bedrock:*::foundation-model/{foundation_model}",
+                    f"arn:aws:bedrock:::foundation-model/{foundation_model}",
                 ],
-                resources=["*"],
             )
         )
         """  Create a Function URL  """
         # This creates a public HTTPS endpoint (a “Lambda Function URL”).
         # auth_type.NONE means no authentication (anyone can call it — again fine for testing, not for production).
-        # invoke_mode.RESPONSE_STREAM allows real-time streaming responses from Bedrock (e.g., text generating live).
+        # invoke_mode.RESPONSE_STREAM allows real-time streaming responses from Bedrock (e.g., text generating live);
+        # invoke_mode.BUFFERED (STREAM=0) returns the full response in one go.
         # CORS allows requests from any origin, so your frontend JavaScript can call it directly.
-        fn_url = fn.add_function_url(
+        # The URL points at a "live" alias with one provisioned-concurrency instance, so the
+        # first request after idle doesn't pay the image pull + container init of a cold start.
+        # (SnapStart isn't available for container-image functions.)
+        live = fn.add_alias("live", provisioned_concurrent_executions=1)
+        fn_url = live.add_function_url(
             auth_type=_lambda.FunctionUrlAuthType.NONE,
-            invoke_mode=_lambda.InvokeMode.RESPONSE_STREAM,
+            invoke_mode=invoke_mode,
             cors=_lambda.FunctionUrlCorsOptions(
                 allowed_methods=[_lambda.HttpMethod.ALL],
                 allowed_origins=["*"],
@@ -99,11 +148,15 @@ class Backend(Construct):
         # Fn.split('/', ...) splits by /,
         # and Fn.select(2, ...) picks the third element (index 2), which gives:
         # abcdefg123.lambda-url.us-west-2.on.aws
+        # (a single Fn::Select/Fn::Split pair; Fn.parse_domain_name would nest two).
         # That domain is passed to the frontend (so it knows where to send API calls).
+        # "abcdefg123" is a random id Lambda assigns when the URL is created, not the function
+        # name, so the host can't be built as a plain Python string: the split has to happen
+        # in CloudFormation. fn_url.url is already the URL resource's FunctionUrl attribute
+        # (the same thing as CfnUrl.attr_function_url), and the split token is built once
+        # and handed to the frontend as-is.
         self.endpoint = fn_url.url
-        self.domain_name = Fn.select(
-            2, Fn.split("/", self.endpoint)
-        )  # Remove the protocol part from the URL
+        self.domain_name = domain_name_of(self.endpoint)
 
 
 """
@@ -140,9 +193,9 @@ That means everything that follows — such as:
     fn = _lambda.DockerImageFunction(...)
     _ = state_bucket.grant_read_write(fn)
     fn.add_to_role_policy(...)
-    fn_url = fn.add_function_url(...)
+    fn_url = fn.add_alias("live", ...).add_function_url(...)
     self.endpoint = fn_url.url
-    self.domain_name = Fn.select(...)
+    self.domain_name = domain_name_of(...)
 
 
 — is all being executed when the Backend construct is created.
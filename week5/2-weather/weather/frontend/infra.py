@@ -1,5 +1,5 @@
 # Import AWS CDK core utilities and constructs
-from aws_cdk import Duration, RemovalPolicy
+from aws_cdk import Duration, RemovalPolicy, Size
 from constructs import Construct
 
 # Import AWS CDK modules for CloudFront, S3, and deployments
@@ -28,14 +28,6 @@ class Frontend(Construct):
             removal_policy=RemovalPolicy.DESTROY,
         )
 
-        # 🚀 Deploy local frontend build artifacts into the S3 bucket
-        # The files come from ./weather/frontend/src (your local frontend build output)
-        _ = s3deploy.BucketDeployment(
-            self,
-            "DeployFrontend",
-            sources=[s3deploy.Source.asset("./weather/frontend/src")],
-            destination_bucket=frontend_bucket,
-        )
         # 🌐 Define an S3 origin for CloudFront, allowing read and list access
         s3_origin = origins.S3BucketOrigin.with_origin_access_control(
             frontend_bucket,
@@ -59,6 +51,21 @@ class Frontend(Construct):
             keepalive_timeout=Duration.seconds(60),
             connection_timeout=Duration.seconds(10),
         )
+        # 🗜️ Cache policy for everything else served from S3 (index.html and other app files).
+        # The cache key ignores query strings, headers and cookies, so every visitor shares one
+        # cached copy per encoding. The 1 hour default only applies to objects without a
+        # Cache-Control header; the deployment below sets its own max-age.
+        spa_cache_policy = cloudfront.CachePolicy(
+            self,
+            "SpaCachePolicy",
+            default_ttl=Duration.hours(1),
+            max_ttl=Duration.days(365),
+            enable_accept_encoding_brotli=True,
+            enable_accept_encoding_gzip=True,
+            query_string_behavior=cloudfront.CacheQueryStringBehavior.none(),
+            header_behavior=cloudfront.CacheHeaderBehavior.none(),
+            cookie_behavior=cloudfront.CacheCookieBehavior.none(),
+        )
         # 🌍 Create a CloudFront distribution
         # - Serves static assets (default root = index.html)
         # - Routes specific paths (/chat) to backend
@@ -67,7 +74,8 @@ class Frontend(Construct):
             "Distribution",
             default_root_object="index.html",  # When someone visits "/", serve index.html
             default_behavior=cloudfront.BehaviorOptions(
-                origin=s3_origin
+                origin=s3_origin,
+                cache_policy=spa_cache_policy,
             ),  # S3 static files
             additional_behaviors={
                 "/chat": cloudfront.BehaviorOptions(
@@ -75,9 +83,29 @@ class Frontend(Construct):
                     origin_request_policy=origin_request_policy,
                     allowed_methods=cloudfront.AllowedMethods.ALLOW_ALL,
                     cache_policy=cloudfront.CachePolicy.CACHING_DISABLED,  # don't cache API responses
-                )
+                ),
             },
         )  # Any request to /chat is forwarded to the backend API
+        # 🚀 Deploy local frontend build artifacts into the S3 bucket
+        # The files come from ./weather/frontend/src (your local frontend build output)
+        # The deployment runs `aws s3 sync` inside a CDK-provided Lambda; Lambda CPU scales
+        # with memory, so 1024 MB (vs the 128 MB default) makes the sync much faster, and the
+        # extra /tmp space leaves room to unpack larger builds.
+        # The frontend is a single index.html whose name never changes, so it gets a short
+        # max-age rather than long-lived caching.
+        # ♻️ Passing the distribution makes the deployment create one invalidation after each
+        # sync, so an updated index.html is visible without waiting for its TTL.
+        _ = s3deploy.BucketDeployment(
+            self,
+            "DeployFrontend",
+            sources=[s3deploy.Source.asset("./weather/frontend/src")],
+            destination_bucket=frontend_bucket,
+            cache_control=[s3deploy.CacheControl.max_age(Duration.minutes(5))],
+            memory_limit=1024,
+            ephemeral_storage_size=Size.gibibytes(1),
+            distribution=distribution,
+            distribution_paths=["/*"],
+        )
         # 🏁 Expose the CloudFront distribution's public URL (used in stack.py)
         self.domain_name = distribution.distribution_domain_name
 
@@ -1,14 +1,82 @@
+import hashlib
 import json
+import logging
 import boto3
+from botocore.config import Config
+from collections import OrderedDict
 import os
+import re
+import time
 from pydantic import BaseModel, Field
 from strands import Agent
-import uuid
+from strands.models import BedrockModel
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
 model_id = os.environ.get("MODEL_ID", "")
-s3_client = boto3.client("s3")
+# Keep-alive + a connection pool let warm containers reuse the TLS connections to S3
+# and DynamoDB instead of handshaking again on every invocation.
+boto_config = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={"max_attempts": 2, "mode": "standard"},
+)
+s3_client = boto3.client("s3", config=boto_config)
+
+# Keep-alive lets consecutive invocations of a warm container reuse the
+# bedrock-runtime connection.
+model = BedrockModel(
+    model_id=model_id,
+    boto_client_config=Config(tcp_keepalive=True),
+)
+
+agent = Agent(model=model, callback_handler=None)
+
+# Results for documents already extracted, keyed by the SHA-256 of the file:
+# re-uploads of the same PDF skip the model entirely.
+table = boto3.resource("dynamodb", config=boto_config).Table(os.environ["DDB_TABLE"])
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+# Warm containers also keep the last few results in memory, skipping even DynamoDB.
+LOCAL_CACHE_SIZE = 32
+local_cache: OrderedDict[str, dict] = OrderedDict()
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# First "{" to last "}" of the raw response, compiled once per container.
+JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+VALIDATOR_PROMPT = """
+Is this document a bank statement?
+
+You MUST respond with only a single, valid JSON object with a single key "is_bank_statement" and a boolean value. Do not include any other text, explanations, or markdown formatting.
+"""
+
+EXTRACTOR_PROMPT = """
+Analyze the provided bank statement document and extract the following fields: BankName, AccountNumber, OpeningBalance, ClosingBalance, StartDate, and EndDate.
+
+You MUST respond with only a single, valid JSON object containing the extracted data. Do not include any other text, explanations, or markdown formatting.
+"""
+
+# A cached extraction is only reused for the model and prompts that produced it:
+# changing either one starts a fresh set of cache keys.
+CACHE_VERSION = hashlib.sha256(
+    "\n".join((model_id, VALIDATOR_PROMPT, EXTRACTOR_PROMPT)).encode()
+).hexdigest()[:16]
+
+# Same required fields as the output validator; only results it would accept are cached.
+REQUIRED_FIELDS = ("BankName", "AccountNumber", "ClosingBalance", "StartDate", "EndDate")
 
-agent = Agent(model=model_id, callback_handler=None)
+
+# No module-level schema cache is needed: Strands already builds each model's tool spec
+# (model_json_schema) once per class and reuses it for later structured output calls.
+class ValidationResult(BaseModel):
+    """Model that contains the validation result for a bank statement"""
+
+    is_bank_statement: bool = Field(
+        description="Whether the document is a bank statement"
+    )
 
 
 class BankStatementData(BaseModel):
@@ -22,24 +90,71 @@ class BankStatementData(BaseModel):
     EndDate: str = Field(description="End date of the statement period")
 
 
-def extract_bank_statement_data(document: bytes) -> dict:
+def validate_bank_statement(document: bytes | bytearray, request_id: str) -> bool:
     """
-    Extracts structured data from a bank statement document.
+    Validates if a document is a bank statement using structured output.
+    The Lambda request id doubles as the (unique) document name.
     """
-    extractor_prompt = """
-Analyze the provided bank statement document and extract the following fields: BankName, AccountNumber, OpeningBalance, ClosingBalance, StartDate, and EndDate.
+    response = None
+    try:
+        # Every document is independent: don't resend earlier conversations to the model.
+        agent.messages.clear()
+        response = agent(
+            [
+                {"text": VALIDATOR_PROMPT},
+                {
+                    "document": {
+                        "format": "pdf",
+                        "name": f"check-{request_id}",
+                        "source": {
+                            "bytes": document,
+                        },
+                    },
+                },
+            ],
+            structured_output_model=ValidationResult,
+        )
 
-You MUST respond with only a single, valid JSON object containing the extracted data. Do not include any other text, explanations, or markdown formatting.
-"""
+        # Strands has already parsed and validated the structured output; only scrape
+        # the raw text when it couldn't.
+        validation_result = getattr(response, "structured_output", None)
+        if isinstance(validation_result, ValidationResult):
+            logger.info("Using structured output for validation.")
+            return validation_result.is_bank_statement
+
+        raw_response_text = str(response)
+        logger.debug("Raw LLM response for validation: %s", raw_response_text)
+
+        # Manually find and parse the JSON from the raw response
+        match = JSON_OBJECT.search(raw_response_text)
+        if match is None:
+            raise ValueError("No JSON object found in the response.")
+
+        # Parse and validate in a single pydantic-core pass, without an intermediate dict
+        validation_result = ValidationResult.model_validate_json(match.group())
+
+        logger.info("Successfully parsed structured output for validation manually.")
+        return validation_result.is_bank_statement
+
+    except Exception as e:
+        logger.warning("Could not extract and parse structured validation result: %s", e)
+        return False
+
+
+def extract_bank_statement_data(document: bytes | bytearray, request_id: str) -> dict:
+    """
+    Extracts structured data from a bank statement document.
+    """
     response = None
     try:
+        agent.messages.clear()
         response = agent(
             [
-                {"text": extractor_prompt},
+                {"text": EXTRACTOR_PROMPT},
                 {
                     "document": {
                         "format": "pdf",
-                        "name": f"bank_statement-{uuid.uuid4()}",
+                        "name": f"bank_statement-{request_id}",
                         "source": {
                             "bytes": document,
                         },
@@ -49,67 +164,186 @@ You MUST respond with only a single, valid JSON object containing the extracted
             structured_output_model=BankStatementData,
         )
 
+        # Strands has already parsed and validated the structured output; only scrape
+        # the raw text when it couldn't.
+        bank_statement_data = getattr(response, "structured_output", None)
+        if isinstance(bank_statement_data, BankStatementData):
+            logger.info("Using structured output for extraction.")
+            return bank_statement_data.model_dump()
+
         raw_response_text = str(response)
-        print(f"Raw LLM response for extraction: {raw_response_text}")
+        logger.debug("Raw LLM response for extraction: %s", raw_response_text)
 
         # Manually find and parse the JSON from the raw response
-        json_start = raw_response_text.find('{')
-        json_end = raw_response_text.rfind('}') + 1
-        if json_start == -1 or json_end == 0:
+        match = JSON_OBJECT.search(raw_response_text)
+        if match is None:
             raise ValueError("No JSON object found in the response.")
-        
-        cleaned_json_str = raw_response_text[json_start:json_end]
-        
-        parsed_json = json.loads(cleaned_json_str)
-        
-        # Validate the parsed JSON with the Pydantic model
-        bank_statement_data = BankStatementData(**parsed_json)
-        
-        print("Successfully parsed and validated structured output for extraction manually.")
+
+        # Parse and validate the JSON with the Pydantic model in one pass
+        bank_statement_data = BankStatementData.model_validate_json(match.group())
+
+        logger.info("Successfully parsed and validated structured output for extraction manually.")
         return bank_statement_data.model_dump()
 
     except Exception as e:
-        print(f"Could not extract and parse structured extraction result: {e}")
+        logger.warning("Could not extract and parse structured extraction result: %s", e)
         return {}
 
 
+def read_body(response: dict) -> tuple[bytearray, str]:
+    """
+    Reads an S3 GetObject body into a buffer sized from ContentLength, so the
+    PDF is held once instead of being joined from botocore's read buffers.
+    Returns the content and its SHA-256, hashed while streaming.
+    """
+    body = bytearray(response["ContentLength"])
+    view = memoryview(body)
+    digest = hashlib.sha256()
+    offset = 0
+    for chunk in response["Body"].iter_chunks(READ_CHUNK_SIZE):
+        view[offset : offset + len(chunk)] = chunk
+        digest.update(chunk)
+        offset += len(chunk)
+    return body, digest.hexdigest()
+
+
+def has_required_fields(extracted_data: dict) -> bool:
+    """
+    Mirrors the output validator's check, so incomplete results are never cached.
+    """
+    for field in REQUIRED_FIELDS:
+        value = extracted_data.get(field)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return False
+    return True
+
+
+def get_cached_extraction(content_hash: str) -> dict | None:
+    """
+    Looks up a previous extraction of an identical document.
+    The cache is an optimization: a DynamoDB error is logged and treated as a miss.
+    """
+    cache_key = f"{content_hash}#{CACHE_VERSION}"
+    if cache_key in local_cache:
+        local_cache.move_to_end(cache_key)
+        return local_cache[cache_key]
+
+    try:
+        item = table.get_item(Key={"PK": "CACHE", "SK": cache_key}).get("Item")
+    except Exception as e:
+        logger.warning("Extraction cache lookup failed: %s", e)
+        return None
+    if not item:
+        return None
+    extracted_data = json.loads(item["extracted_data"])
+    remember_locally(cache_key, extracted_data)
+    return extracted_data
+
+
+def cache_extraction(content_hash: str, extracted_data: dict) -> None:
+    """
+    Stores an extraction result; DynamoDB expires it after CACHE_TTL_SECONDS.
+    A failed write is logged and otherwise ignored.
+    """
+    cache_key = f"{content_hash}#{CACHE_VERSION}"
+    remember_locally(cache_key, extracted_data)
+    try:
+        table.put_item(
+            Item={
+                "PK": "CACHE",
+                "SK": cache_key,
+                # Stored as JSON: DynamoDB would otherwise need Decimal for the balances
+                "extracted_data": json.dumps(extracted_data),
+                "expires_at": int(time.time()) + CACHE_TTL_SECONDS,
+            }
+        )
+    except Exception as e:
+        logger.warning("Extraction cache write failed: %s", e)
+
+
+def remember_locally(cache_key: str, extracted_data: dict) -> None:
+    local_cache[cache_key] = extracted_data
+    local_cache.move_to_end(cache_key)
+    while len(local_cache) > LOCAL_CACHE_SIZE:
+        local_cache.popitem(last=False)
+
+
 def handler(event, context):
     """
-    Lambda handler for document extraction.
+    Lambda handler for Step Functions triggered by S3 PutObject events.
+
+    Downloads the document once, checks that it is a bank statement and, if so,
+    extracts its data in the same invocation. Retries from the output validator
+    carry is_bank_statement=True and skip straight to extraction.
     """
     try:
-        print("Extracting document data...")
-        print(f"Event: {json.dumps(event)}")
+        # The event is only formatted when DEBUG is enabled
+        logger.debug("Event: %s", event)
+
+        if "Records" in event:
+            # Direct S3 event trigger
+            s3_event = event["Records"][0]
+            bucket = s3_event["s3"]["bucket"]["name"]
+            key = s3_event["s3"]["object"]["key"]
+        else:
+            # Step Functions input format
+            bucket = event["bucket"]
+            key = event["key"]
 
-        bucket = event["bucket"]
-        key = event["key"]
+        logger.info(
+            "Extracting document data from s3://%s/%s (attempt %d)",
+            bucket, key, event.get("retry_count", 0) + 1,
+        )
 
         # Get the object from S3
         response = s3_client.get_object(Bucket=bucket, Key=key)
 
         # Read the binary content
-        file_content = response["Body"].read()
+        file_content, content_hash = read_body(response)
 
-        extracted_data = extract_bank_statement_data(file_content)
+        # Only the first attempt may use the cache: a retry means the output validator
+        # rejected the previous result, so it must be extracted again.
+        if not event.get("retry_count"):
+            cached = get_cached_extraction(content_hash)
+            if cached:
+                logger.info("Using cached extraction for document %s", content_hash)
+                return {
+                    "bucket": bucket,
+                    "key": key,
+                    "is_bank_statement": True,
+                    "valid": True,
+                    "extracted_data": cached,
+                    "retry_count": 1,
+                }
+
+        is_bank_statement = event.get("is_bank_statement") or validate_bank_statement(
+            file_content, context.aws_request_id
+        )
+        extracted_data = (
+            extract_bank_statement_data(file_content, context.aws_request_id)
+            if is_bank_statement
+            else {}
+        )
 
         is_valid = bool(extracted_data)
+        if is_valid and has_required_fields(extracted_data):
+            cache_extraction(content_hash, extracted_data)
 
         return {
             "bucket": bucket,
             "key": key,
+            "is_bank_statement": is_bank_statement,
             "valid": is_valid,
             "extracted_data": extracted_data,
             "retry_count": event.get("retry_count", 0) + 1,
         }
     except Exception as e:
-        import traceback
-
-        print("Handler in extractor failed with exception:")
-        traceback.print_exc()
+        logger.exception("Handler in extractor failed with exception")
         # Return a failure response that can be handled by the next step
         return {
             "bucket": event.get("bucket"),
             "key": event.get("key"),
+            "is_bank_statement": event.get("is_bank_statement", False),
             "valid": False,
             "extracted_data": {},
             "retry_count": event.get("retry_count", 0) + 1,
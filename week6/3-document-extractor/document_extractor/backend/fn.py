@@ -19,14 +19,16 @@ class Fn(Construct):
 
         self.function = _lambda.Function(self, 'Fn',
                           timeout=Duration.seconds(timeout),
-                          architecture=_lambda.Architecture.X86_64,
+                          architecture=_lambda.Architecture.ARM_64,
                           runtime=_lambda.Runtime.PYTHON_3_13,
                           code=_lambda.Code.from_asset(code_path,
                                     bundling=BundlingOptions(
                                         image=_lambda.Runtime.PYTHON_3_13.bundling_image,
+                                        # The bundling container stays native (no arm64 emulation needed);
+                                        # pip fetches the aarch64 wheels (e.g. pydantic-core) for the Graviton runtime instead.
                                         command=[
                                             'bash', '-c',
-                                            'pip install uv && uv export --frozen --no-dev --no-editable -o requirements.txt && pip install -r requirements.txt -t /asset-output && cp -r *py /asset-output/'
+                                            'pip install uv && uv export --frozen --no-dev --no-editable -o requirements.txt && pip install -r requirements.txt --platform manylinux2014_aarch64 --only-binary=:all: --python-version 3.13 --implementation cp -t /asset-output && cp -r *py /asset-output/'
                                         ],
                                         user='root'
                                     )
@@ -23,19 +23,17 @@ class Backend(Construct):
                                           partition_key=dynamodb.Attribute(name='PK', type=dynamodb.AttributeType.STRING),
                                           sort_key=dynamodb.Attribute(name='SK', type=dynamodb.AttributeType.STRING),
                                           removal_policy=RemovalPolicy.DESTROY,
+                                          time_to_live_attribute='expires_at',
                                          )
         input_bucket = s3.Bucket(self, 'InputBucket', event_bridge_enabled=True)
 
-        validate_input_fn = Fn(self, 'ValidateInputFn',
-                               code_path='document_extractor/backend/input_validator',
-                               bucket=input_bucket,
-                               timeout=120,
-                               )
-        
+        # Validates the input document and extracts its data in one invocation:
+        # one cold start and one S3 GET per document instead of two
         extractor_fn = Fn(self, 'ExtractorFn',
                           code_path='document_extractor/backend/extractor',
                           bucket=input_bucket,
-                          timeout=120)
+                          ddb_table=dynamodb_table,  # extraction cache, keyed by document hash
+                          timeout=180)
         
         # Create output validator function stub
         output_validator_fn = Fn(self, 'OutputValidatorFn',
@@ -43,10 +41,6 @@ class Backend(Construct):
                                  timeout=30)
         
         # Step Functions tasks
-        validate_input_task = tasks.LambdaInvoke(self, 'ValidateInputTask',
-                                               lambda_function=validate_input_fn.function,
-                                               output_path='$.Payload')
-        
         extract_task = tasks.LambdaInvoke(self, 'ExtractTask',
                                         lambda_function=extractor_fn.function,
                                         output_path='$.Payload')
@@ -61,9 +55,9 @@ class Backend(Construct):
                                error='ValidationError',
                                cause='Document validation failed')
         
-        # Choice state for validation
+        # Choice state for input validation (done by the extractor)
         validation_choice = sfn.Choice(self, 'IsValidDocument')
-        validation_choice.when(sfn.Condition.boolean_equals('$.valid', True), extract_task)
+        validation_choice.when(sfn.Condition.boolean_equals('$.is_bank_statement', True), validate_output_task)
         validation_choice.otherwise(failure_state)
         
         # Choice state for output validation
@@ -73,14 +67,13 @@ class Backend(Construct):
         output_validation_choice.otherwise(extract_task)
         
         # Connect the workflow
-        validate_input_task.next(validation_choice)
-        extract_task.next(validate_output_task)
+        extract_task.next(validation_choice)
         validate_output_task.next(output_validation_choice)
         
         # Create the state machine
         state_machine = sfn.StateMachine(self, 'DocumentProcessingWorkflow',
                                        state_machine_name='DocumentProcessingWorkflow',
-                                       definition=validate_input_task,
+                                       definition=extract_task,
                                        timeout=Duration.minutes(5))
         
         
@@ -1,4 +1,8 @@
-import json
+import logging
+import os
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
 
 def handler(event, context):
@@ -6,8 +10,8 @@ def handler(event, context):
     Validates the output from the extractor function.
     Checks for presence and basic validity of required fields.
     """
-    print("Validating extracted output...")
-    print(f"Event: {json.dumps(event)}")
+    logger.info("Validating extracted output for s3://%s/%s", event.get("bucket"), event.get("key"))
+    logger.debug("Event: %s", event)
 
     extracted_data = event.get("extracted_data", {})
 
@@ -28,15 +32,15 @@ def handler(event, context):
             value = extracted_data.get(field)
             if value is None or (isinstance(value, str) and not value.strip()):
                 is_valid = False
-                print(f"Validation failed for field '{field}'")
+                logger.info("Validation failed for field '%s'", field)
                 break
 
     result = event.copy()
     result["valid"] = is_valid
 
     if is_valid:
-        print("Validation successful.")
+        logger.info("Validation successful.")
     else:
-        print("Validation failed.")
+        logger.info("Validation failed.")
 
     return result
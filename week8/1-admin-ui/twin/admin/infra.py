@@ -55,7 +55,7 @@ class Admin(Construct):
             self,
             "StatusUpdaterFunction",
             runtime=_lambda.Runtime.PYTHON_3_13,
-            architecture=_lambda.Architecture.X86_64,
+            architecture=_lambda.Architecture.ARM_64,
             handler="status_updater.handler",
             code=_lambda.Code.from_asset("twin/admin/src/app"),
             timeout=Duration.seconds(60),
@@ -64,8 +64,8 @@ class Admin(Construct):
             },
         )
 
-        # 2. Grant the new Lambda permission to write to the DynamoDB table
-        self.dynamodb_table.grant_write_data(status_updater_fn)
+        # 2. Grant the new Lambda permission to query and update the DynamoDB table
+        self.dynamodb_table.grant_read_write_data(status_updater_fn)
 
         # 3. EventBridge rule to listen for Bedrock KB events
         rule = events.Rule(
@@ -1,15 +1,77 @@
 import os
 import boto3
 import logging
+from boto3.dynamodb.types import TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
-dynamodb = boto3.resource('dynamodb')
+# update_item is network-bound and boto3 releases the GIL while waiting on it.
+UPDATE_WORKERS = 16
+
+# The low-level client skips the Table resource's per-item (de)serialization layer;
+# the pool is sized to the update workers so they don't queue for connections.
+ddb = boto3.client(
+    'dynamodb',
+    config=Config(tcp_keepalive=True, max_pool_connections=UPDATE_WORKERS * 2),
+)
+serializer = TypeSerializer()
 table_name = os.environ.get('DDB_TABLE')
 if not table_name:
     raise ValueError("DDB_TABLE environment variable is not set.")
-table = dynamodb.Table(table_name)
+
+EXPRESSION_VALUES = {
+    ':pk': serializer.serialize('QUESTIONS'),
+    ':empty': serializer.serialize(''),
+    ':t': serializer.serialize(True),
+    ':f': serializer.serialize(False),
+}
+
+
+def answered_unprocessed_questions():
+    """
+    Yields every answered question that is not yet processed, following
+    LastEvaluatedKey so result sets larger than 1 MB aren't silently truncated.
+    The filtering happens in DynamoDB rather than in Python, and only the keys
+    needed by mark_processed are returned. Items are in DynamoDB AttributeValue form.
+    """
+    paginator = ddb.get_paginator('query')
+    pages = paginator.paginate(
+        TableName=table_name,
+        KeyConditionExpression='PK = :pk',
+        FilterExpression='attribute_exists(answer) AND answer <> :empty'
+        ' AND (attribute_not_exists(#p) OR #p = :f)',
+        ProjectionExpression='PK, SK',
+        ExpressionAttributeNames={'#p': 'processed'},
+        ExpressionAttributeValues={k: EXPRESSION_VALUES[k] for k in (':pk', ':empty', ':f')},
+    )
+    for page in pages:
+        yield from page.get('Items', [])
+
+
+def mark_processed(question) -> bool:
+    """
+    Sets only the `processed` attribute, instead of rewriting the whole item.
+    Returns False if the question was already processed (e.g. by a concurrent run).
+    """
+    try:
+        ddb.update_item(
+            TableName=table_name,
+            Key={'PK': question['PK'], 'SK': question['SK']},
+            UpdateExpression='SET #p = :t',
+            ConditionExpression='attribute_not_exists(#p) OR #p = :f',
+            ExpressionAttributeNames={'#p': 'processed'},
+            ExpressionAttributeValues={k: EXPRESSION_VALUES[k] for k in (':t', ':f')},
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
+
 
 def handler(event, context):
     """
@@ -19,49 +81,37 @@ def handler(event, context):
     If the job has completed successfully, it updates all answered questions
     in the DynamoDB table to have `processed = True`.
     """
-    logger.info(f"Received event: {event}")
+    logger.debug("Received event: %s", event)
 
     job_status = event.get('detail', {}).get('status')
 
     if job_status == 'COMPLETED':
         logger.info("Ingestion job completed. Marking all answered questions as processed.")
         try:
-            # Get all questions from DynamoDB
-            response = table.query(
-                KeyConditionExpression=boto3.dynamodb.conditions.Key('PK').eq('QUESTIONS')
-            )
-            all_questions = response.get('Items', [])
-            logger.info(f"Found {len(all_questions)} total questions.")
-
-            # Filter for answered questions that are not yet processed
-            answered_questions = [
-                q for q in all_questions
-                if 'answer' in q and q['answer'] and not q.get('processed', False)
-            ]
-            logger.info(f"Found {len(answered_questions)} answered questions to mark as processed.")
+            # Get the answered questions that are not yet processed from DynamoDB
+            answered_questions = list(answered_unprocessed_questions())
+            logger.info("Found %d answered questions to mark as processed.", len(answered_questions))
 
             if not answered_questions:
                 logger.info("No questions to update.")
                 return {'statusCode': 200, 'body': 'No questions to update.'}
 
             # Mark them as processed
-            with table.batch_writer() as batch:
-                for q in answered_questions:
-                    q['processed'] = True
-                    batch.put_item(Item=q)
+            with ThreadPoolExecutor(max_workers=UPDATE_WORKERS) as executor:
+                updated = sum(executor.map(mark_processed, answered_questions))
 
-            logger.info(f"Successfully marked {len(answered_questions)} questions as processed.")
+            logger.info("Successfully marked %d questions as processed.", updated)
 
         except Exception as e:
-            logger.error(f"Error updating questions in DynamoDB: {e}", exc_info=True)
+            logger.exception("Error updating questions in DynamoDB: %s", e)
             raise
     
     elif job_status == 'FAILED':
-        logger.error(f"Ingestion job failed. Details: {event.get('detail', {})}")
+        logger.error("Ingestion job failed. Details: %s", event.get('detail', {}))
         # You could add logic here to notify an administrator.
 
     else:
-        logger.info(f"Ingestion job status is '{job_status}'. No action taken.")
+        logger.info("Ingestion job status is '%s'. No action taken.", job_status)
 
     return {
         'statusCode': 200,
@@ -2,6 +2,7 @@ import uuid
 import os
 import boto3
 import logging
+from botocore.config import Config
 from pydantic import BaseModel, Field
 from botocore.exceptions import ClientError
 from datetime import datetime
@@ -9,6 +10,9 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Keep connections to AWS alive between requests on a warm container.
+boto_config = Config(tcp_keepalive=True, max_pool_connections=10)
+
 
 class Question(BaseModel):
     """
@@ -82,9 +86,9 @@ class QuestionManager:
         - Gets table name from environment variables.
         """
         logger.info("Initialising QuestionManager")
-        self.dynamodb = boto3.resource('dynamodb')
-        self.s3_client = boto3.client('s3')
-        self.bedrock_agent_client = boto3.client('bedrock-agent')
+        self.dynamodb = boto3.resource('dynamodb', config=boto_config)
+        self.s3_client = boto3.client('s3', config=boto_config)
+        self.bedrock_agent_client = boto3.client('bedrock-agent', config=boto_config)
 
         self.table_name = os.environ.get('DDB_TABLE')
         if not self.table_name:
@@ -1,9 +1,25 @@
 import logging
+import threading
 from strands import tool
 from questions import QuestionManager
 
 logger = logging.getLogger(__name__)
 
+# One QuestionManager (and its boto3 clients/connections) per container, created on first use.
+# Strands may run tools concurrently, hence the lock.
+_question_manager: QuestionManager | None = None
+_question_manager_lock = threading.Lock()
+
+
+def get_question_manager() -> QuestionManager:
+    global _question_manager
+    if _question_manager is None:
+        with _question_manager_lock:
+            if _question_manager is None:
+                _question_manager = QuestionManager()
+    return _question_manager
+
+
 @tool
 def log_unanswered_question(question: str, name: str, email: str) -> str:
     """
@@ -18,9 +34,9 @@ def log_unanswered_question(question: str, name: str, email: str) -> str:
     Returns:
         A confirmation message indicating that the question has been logged.
     """
-    logger.info(f"Logging unanswered question: '{question}' from {name} ({email})")
+    logger.info("Logging unanswered question: '%s' from %s (%s)", question, name, email)
     try:
-        question_manager = QuestionManager()
+        question_manager = get_question_manager()
         question_manager.add_question(
             question=question,
             user_name=name,